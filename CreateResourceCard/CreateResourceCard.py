@@ -13,39 +13,86 @@ How to run:
 Python stdlib only. Tested with Python 3.9+.
 """
 
+import functools
 import re
+import string
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from html import escape
 
 APP_TITLE = "HTML Card Snippet Generator"
 
+# Platform ttk theme, resolved once at import
+_THEME = {"win32": "vista", "darwin": "aqua"}.get(sys.platform, "clam")
+
+# Precompiled pattern (avoid re-lookup on every title call)
+_WS_RE = re.compile(r'\s+')
+
+# Deletion table for slugs: drop every ASCII char that's not a-z / 0-9
+_KEEP = set(string.ascii_lowercase + string.digits)
+_DEL_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in _KEEP))
+
+# Single-pass equivalent of html.escape(s, quote=True)
+_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+@functools.lru_cache(maxsize=512)
 def slugify_for_i18n(s: str) -> str:
     """
     Convert a name to a lowercase, no-spaces, alphanumeric-only slug suitable
     for i18n keys, e.g. "Doja SDK" -> "dojasdk".
     """
-    s = s.lower()
-    # Remove any character that's not a-z / 0-9
-    s = re.sub(r'[^a-z0-9]+', '', s)
-    return s
+    # Drop non-ASCII first, then any character that's not a-z / 0-9
+    return s.lower().encode('ascii', 'ignore').decode('ascii').translate(_DEL_TABLE)
 
-def slugify_simple(s: str) -> str:
-    """
-    Slightly different slugifier for labels (category/tag) when used in i18n keys.
-    This keeps letters and digits; removes everything else.
-    Example: "Tools & Utilities" -> "toolsutilities"
-    """
-    return slugify_for_i18n(s)
+# Labels (category/tag) use the same rule when turned into i18n keys,
+# e.g. "Tools & Utilities" -> "toolsutilities"
+slugify_simple = slugify_for_i18n
 
+@functools.lru_cache(maxsize=512)
 def default_title_from_name(name: str) -> str:
     """
     A helpful default: return the name in Title Case.
     """
     if not name:
         return ""
-    return " ".join(w.capitalize() for w in re.split(r'\s+', name.strip()))
+    return " ".join(w.capitalize() for w in _WS_RE.split(name.strip()))
+
+# Card markup; placeholders are filled by build_html via str.format_map
+_CARD_TEMPLATE = """<!-- Card: {card_name} -->
+<li class="cs-li resource-card"
+    data-category="{data_category}"
+    data-tags="{data_tags}"
+    data-search="{data_search}">
+  <div class="cs-flex">
+    <div>
+      <h3 class="cs-h3" data-i18n="{title_i18n}">{v_title}</h3>
+      <p class="cs-li-text" data-i18n="{desc_i18n}">
+        {v_desc}
+      </p>
+      <div class="meta">
+        <span class="pill" data-i18n="{cat_i18n}">{v_cat_label}</span>
+        <span class="pill" data-i18n="{tag_i18n}">{v_first_tag_label}</span>
+      </div>
+      <div class="resource-actions">
+        <a href="{href_attr}" target="_blank" rel="noopener" class="btn btn-primary" data-i18n="resources.open">Open</a>
+      </div>
+    </div>
+  </div>
+</li>"""
+
+@functools.lru_cache(maxsize=1024)
+def _esc(s: str) -> str:
+    """
+    Cached HTML escape (quotes included); the same field values are escaped
+    on every regeneration.
+    """
+    return s.translate(_ESCAPE_TABLE)
 
 def build_html(card_name: str,
                category: str,
@@ -85,16 +132,16 @@ def build_html(card_name: str,
         visible_desc = f"{default_title_from_name(card_name)} resource."
 
     # Escape visible text (content), not attributes for i18n keys
-    v_title = escape(visible_title)
-    v_desc  = escape(visible_desc)
-    v_cat_label = escape(cat_label)
-    v_first_tag_label = escape(first_tag_label)
+    v_title = _esc(visible_title)
+    v_desc  = _esc(visible_desc)
+    v_cat_label = _esc(cat_label)
+    v_first_tag_label = _esc(first_tag_label)
 
     # Attributes
-    data_category = escape(cat, quote=True)
-    data_tags = escape(tags_attr, quote=True)
-    data_search = escape((search_terms or "").strip(), quote=True)
-    href_attr = escape((href or "").strip(), quote=True)
+    data_category = _esc(cat)
+    data_tags = _esc(tags_attr)
+    data_search = _esc((search_terms or "").strip())
+    href_attr = _esc((href or "").strip())
 
     # i18n keys for title/desc use the 'name_slug'
     title_i18n = f"resources.cards.{name_slug}.title"
@@ -112,28 +159,21 @@ def build_html(card_name: str,
         tag_i18n = "resources.tag.emulator"
 
     # Compose the HTML
-    html = f"""<!-- Card: {escape(card_name)} -->
-<li class="cs-li resource-card"
-    data-category="{data_category}"
-    data-tags="{data_tags}"
-    data-search="{data_search}">
-  <div class="cs-flex">
-    <div>
-      <h3 class="cs-h3" data-i18n="{title_i18n}">{v_title}</h3>
-      <p class="cs-li-text" data-i18n="{desc_i18n}">
-        {v_desc}
-      </p>
-      <div class="meta">
-        <span class="pill" data-i18n="{cat_i18n}">{v_cat_label}</span>
-        <span class="pill" data-i18n="{tag_i18n}">{v_first_tag_label}</span>
-      </div>
-      <div class="resource-actions">
-        <a href="{href_attr}" target="_blank" rel="noopener" class="btn btn-primary" data-i18n="resources.open">Open</a>
-      </div>
-    </div>
-  </div>
-</li>"""
-    return html
+    return _CARD_TEMPLATE.format_map({
+        "card_name": _esc(card_name),
+        "data_category": data_category,
+        "data_tags": data_tags,
+        "data_search": data_search,
+        "title_i18n": title_i18n,
+        "v_title": v_title,
+        "desc_i18n": desc_i18n,
+        "v_desc": v_desc,
+        "cat_i18n": cat_i18n,
+        "v_cat_label": v_cat_label,
+        "tag_i18n": tag_i18n,
+        "v_first_tag_label": v_first_tag_label,
+        "href_attr": href_attr,
+    })
 
 class CardGUI(ttk.Frame):
     def __init__(self, master):
@@ -191,19 +231,22 @@ class CardGUI(ttk.Frame):
         gen_btn = ttk.Button(btns, text="Generate HTML", command=self.on_generate)
         gen_btn.grid(row=0, column=0, sticky="w")
 
-        copy_btn = ttk.Button(btns, text="Copy to Clipboard", command=self.copy_to_clipboard)
-        copy_btn.grid(row=0, column=1, padx=(8, 0))
+        # Copy/Save only read the output box, so they stay disabled until the first Generate
+        self.copy_btn = ttk.Button(btns, text="Copy to Clipboard", command=self.copy_to_clipboard,
+                                   state="disabled")
+        self.copy_btn.grid(row=0, column=1, padx=(8, 0))
 
-        save_btn = ttk.Button(btns, text="Save to File", command=self.save_to_file)
-        save_btn.grid(row=0, column=2, padx=(8, 0))
+        self.save_btn = ttk.Button(btns, text="Save to File", command=self.save_to_file,
+                                   state="disabled")
+        self.save_btn.grid(row=0, column=2, padx=(8, 0))
 
         # Output textbox
         self.output = tk.Text(self, height=20, wrap="word")
         self.output.grid(row=row+1, column=0, columnspan=2, sticky="nsew")
         self.rowconfigure(row+1, weight=1)
 
-        # Initial generation
-        self.on_generate()
+        # Last snippet rendered into the output box (skip identical rewrites)
+        self._last_html = None
 
     def _add_labeled_entry(self, label, var, row, help_=""):
         lbl = ttk.Label(self, text=label)
@@ -230,23 +273,26 @@ class CardGUI(ttk.Frame):
             messagebox.showerror("Error", str(e))
             return
 
+        # Nothing to redraw if the snippet is unchanged and the box wasn't hand-edited
+        if html == self._last_html and not self.output.edit_modified():
+            return
+
         self.output.delete("1.0", tk.END)
         self.output.insert(tk.END, html)
+        self.output.edit_modified(False)
+        if self._last_html is None:
+            self.copy_btn.state(["!disabled"])
+            self.save_btn.state(["!disabled"])
+        self._last_html = html
 
     def copy_to_clipboard(self):
         html = self.output.get("1.0", tk.END).strip()
-        if not html:
-            self.on_generate()
-            html = self.output.get("1.0", tk.END).strip()
         self.clipboard_clear()
         self.clipboard_append(html)
         messagebox.showinfo("Copied", "The HTML snippet has been copied to the clipboard.")
 
     def save_to_file(self):
         html = self.output.get("1.0", tk.END).strip()
-        if not html:
-            self.on_generate()
-            html = self.output.get("1.0", tk.END).strip()
 
         filename = filedialog.asksaveasfilename(
             title="Save HTML Snippet",
@@ -269,14 +315,8 @@ def main():
     root.geometry("900x700")
     # Use ttk styling
     try:
-        style = ttk.Style(root)
         # Use platform theme if available
-        if sys.platform == "win32":
-            style.theme_use("vista")
-        elif sys.platform == "darwin":
-            style.theme_use("aqua")
-        else:
-            style.theme_use("clam")
+        ttk.Style(root).theme_use(_THEME)
     except Exception:
         pass
 
@@ -8,10 +8,41 @@ This is used on KeitaiArchive to pull necessary data files from external sources
 
 import json
 import os
+import shutil
 import sys
+import threading
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+
+# Downloads run on worker threads; serialize output so messages don't interleave
+_PRINT_LOCK = threading.Lock()
+
+# Shared session so downloads from the same host reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+
+# Validator cache (url/ETag/Last-Modified per destination), kept beside the config
+# file so no state files end up next to the published data files
+CACHE_FILENAME = 'download_cache.json'
+
+
+def log(message: str) -> None:
+    """Print a message without interleaving with other download threads."""
+    with _PRINT_LOCK:
+        print(message)
 
 
 def load_config(config_path: str) -> List[Dict[str, str]]:
@@ -28,13 +59,44 @@ def load_config(config_path: str) -> List[Dict[str, str]]:
         sys.exit(1)
 
 
-def download_file(url: str, destination: str) -> bool:
+def load_cache(cache_path: str) -> Dict[str, Dict[str, str]]:
+    """Load the validator cache, or start empty if it is missing or unreadable."""
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache_path: str, cache: Dict[str, Dict[str, str]]) -> None:
+    """Write the validator cache atomically."""
+    tmp_path = cache_path + '.part'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+    except IOError as e:
+        print(f"Warning: could not write cache file '{cache_path}': {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def download_file(url: str, destination: str,
+                  cache: Optional[Dict[str, Dict[str, str]]] = None) -> bool:
     """
     Download a file from URL to the specified destination.
     
+    If `cache` holds validators for this destination that were recorded for
+    the same URL, and the file is still there, the request is made
+    conditional (If-None-Match / If-Modified-Since) and an unchanged file is
+    left as-is. The cache entry is updated after a successful download.
+    
     Args:
         url: The download URL
         destination: The full path where the file should be saved
+        cache: Validator cache keyed by destination (see load_cache)
     
     Returns:
         True if successful, False otherwise
@@ -44,26 +106,56 @@ def download_file(url: str, destination: str) -> bool:
         dest_path = Path(destination)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
         
-        print(f"Downloading: {url}")
-        print(f"Destination: {destination}")
+        log(f"Downloading: {url}\nDestination: {destination}")
+        
+        # Make the request conditional only if our copy came from this same URL
+        headers = {}
+        entry = cache.get(destination) if cache is not None else None
+        if entry and entry.get('url') == url and dest_path.exists():
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
         
         # Download the file
-        response = requests.get(url, stream=True, timeout=30)
+        response = _SESSION.get(url, headers=headers, stream=True, timeout=30)
+        if response.status_code == 304:
+            response.close()
+            log(f"Not modified, keeping {destination}\n")
+            return True
         response.raise_for_status()
         
-        # Write to file
-        with open(destination, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Write to a temp file first so a failed transfer never looks up to date
+        # (let urllib3 undo gzip/deflate, copy in 1 MiB blocks)
+        tmp_path = dest_path.with_name(dest_path.name + '.part')
+        response.raw.decode_content = True
+        try:
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+            os.replace(tmp_path, dest_path)
+        finally:
+            # Don't leave partial downloads behind in the data directory
+            if tmp_path.exists():
+                tmp_path.unlink()
+        
+        # Remember validators for the next run (one key per destination,
+        # so worker threads never write the same entry)
+        if cache is not None:
+            cache[destination] = {
+                'url': url,
+                'etag': response.headers.get('ETag', ''),
+                'last_modified': response.headers.get('Last-Modified', ''),
+            }
         
-        print(f"Successfully downloaded to {destination}\n")
+        log(f"Successfully downloaded to {destination}\n")
         return True
         
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading {url}: {e}\n")
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        # Reading response.raw directly surfaces urllib3 errors unwrapped
+        log(f"Error downloading {url}: {e}\n")
         return False
     except IOError as e:
-        print(f"Error writing to {destination}: {e}\n")
+        log(f"Error writing to {destination}: {e}\n")
         return False
 
 
@@ -84,9 +176,13 @@ def main():
     
     print(f"Found {len(downloads)} file(s) to download\n")
     
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(config_path)), CACHE_FILENAME)
+    cache = load_cache(cache_path)
+    
     # Download each file
     success_count = 0
     fail_count = 0
+    jobs = []
     
     for idx, item in enumerate(downloads, 1):
         url = item.get('url')
@@ -97,11 +193,28 @@ def main():
             fail_count += 1
             continue
         
-        print(f"[{idx}/{len(downloads)}]")
-        if download_file(url, destination):
-            success_count += 1
-        else:
-            fail_count += 1
+        jobs.append((url, destination))
+    
+    # Downloads are network-bound, so fetch them concurrently
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as executor:
+            futures = {
+                executor.submit(download_file, url, destination, cache): url
+                for url, destination in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                # One unexpected failure must not hide the tally for the rest
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    log(f"Unexpected error downloading {futures[future]}: {e}\n")
+                    ok = False
+                if ok:
+                    success_count += 1
+                else:
+                    fail_count += 1
+                log(f"[{done}/{len(jobs)}] downloads finished")
+        save_cache(cache_path, cache)
     
     # Summary
     print("=" * 60)
@@ -1,15 +1,24 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from db_shared import close_all_connections
 from export_ff7sb import export_ff7sb
 from export_rockmanx import export_rockmanx
 
 # Define where ALL leaderboard CSVs should be saved
 OUTPUT_DIR = r""   # <-- CHANGE THIS PATH
 
+# Every exporter opens its own DB connection, so they can run side by side
+EXPORTERS = [export_ff7sb, export_rockmanx]
+
 def main():
     print(f"[MASTER] Saving all CSVs to: {OUTPUT_DIR}")
 
-    export_ff7sb(OUTPUT_DIR)
-    export_rockmanx(OUTPUT_DIR)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            # list() re-raises the first exporter failure here
+            list(ex.map(lambda export: export(OUTPUT_DIR), EXPORTERS))
+    finally:
+        close_all_connections()
 
     print("[MASTER] All leaderboards exported successfully.")
 
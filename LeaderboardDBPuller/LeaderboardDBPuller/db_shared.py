@@ -1,4 +1,8 @@
-import psycopg2
+import os
+import threading
+from psycopg2 import sql
+from psycopg2.extensions import encodings
+from psycopg2.pool import ThreadedConnectionPool
 
 # Base config that is shared across all games
 BASE_DB_CONFIG = {
@@ -9,15 +13,96 @@ BASE_DB_CONFIG = {
 
     # SSL options (shared)
     "sslmode": "require",
-    "sslrootcert": ""
+    "sslrootcert": "",
+
+    # TCP keepalive so pooled connections aren't silently dropped
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
 }
 
+# One pool per database, shared by every export that targets it
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
 
 def get_connection(dbname: str):
     """
-    Return a psycopg2 connection to the given database name,
-    using the shared SSL/base settings.
+    Return a psycopg2 connection to the given database name, using the
+    shared SSL/base settings. Connections come from a per-database pool;
+    hand them back with put_connection() instead of closing them.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(dbname)
+        if pool is None:
+            cfg = BASE_DB_CONFIG.copy()
+            cfg["dbname"] = dbname
+            pool = _POOLS[dbname] = ThreadedConnectionPool(1, 8, **cfg)
+    return pool.getconn()
+
+
+def put_connection(dbname: str, conn):
+    """
+    Return a connection obtained from get_connection() to its pool.
+    """
+    _POOLS[dbname].putconn(conn)
+
+
+def close_all_connections():
+    """
+    Close every pooled connection (call once all exports are done).
+    """
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.closeall()
+        _POOLS.clear()
+
+
+def get_columns(conn, table: str, exclude=(), alias=None):
+    """
+    Return a SELECT list for the columns of `table` in table order, minus
+    any in `exclude`, so queries can project only the columns they export.
+    Columns are read from the same `SELECT * FROM table` the queries use,
+    so schema-qualified and mixed-case table names resolve identically.
+    If `alias` is given, each column is qualified with it.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT * FROM {} LIMIT 0".format(table))
+        columns = [desc[0] for desc in cur.description if desc[0] not in exclude]
+    if not columns:
+        raise ValueError("No columns to export from table '{}'".format(table))
+    if alias:
+        return ", ".join(sql.Identifier(alias, c).as_string(conn) for c in columns)
+    return ", ".join(sql.Identifier(c).as_string(conn) for c in columns)
+
+
+def copy_to_csv(conn, query: str, params, csv_path: str) -> int:
+    """
+    Stream the result of `query` (with header) straight into `csv_path`
+    using COPY ... TO STDOUT, without building Python row objects.
+    Values use Postgres's own CSV text: booleans are t/f, timestamps look
+    like "2024-01-02 03:04:05+00", floats use Postgres's shortest form,
+    and empty strings are quoted ("") while NULLs are left empty.
+    Rows go to a temporary file that only replaces `csv_path` when at
+    least one row came back, so an empty or failed export leaves the
+    previous CSV in place. Returns the number of rows written.
     """
-    cfg = BASE_DB_CONFIG.copy()
-    cfg["dbname"] = dbname
-    return psycopg2.connect(**cfg)
+    tmp_path = csv_path + ".part"
+    try:
+        with conn.cursor() as cur:
+            # COPY can't take bind parameters, so inline them safely first
+            bound = cur.mogrify(query, params).decode(encodings[conn.encoding])
+            # COPY hands over one row per write; a 1 MiB buffer batches them.
+            # Bytes are written untouched, so quoted newlines survive as-is.
+            with open(tmp_path, "wb", buffering=1 << 20) as f:
+                cur.copy_expert(
+                    "COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER, ENCODING 'UTF8')".format(bound),
+                    f,
+                )
+            row_count = cur.rowcount
+        if row_count > 0:
+            os.replace(tmp_path, csv_path)
+        return row_count
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -1,6 +1,5 @@
-﻿import csv
-import os
-from db_shared import get_connection
+﻿import os
+from db_shared import copy_to_csv, get_columns, get_connection, put_connection
 
 GAME_NAME = "FF7SB"
 DB_NAME = ""
@@ -9,78 +8,61 @@ MAP_IDS = [1, 3, 5]
 USERNAME_COLUMN = "name"   # change to "playername" if needed
 
 
-def fetch_map(conn, map_id):
-    query = """
-        SELECT *
+def maps_query(columns):
+    """
+    Top 10 runs (one per player) for every map in a single pass, minus
+    'uid', tagged with map_id. `columns` must be qualified with "ranked".
+    Takes the list of map ids twice as parameters.
+    """
+    return """
+        SELECT {columns}, ranked.map AS map_id
         FROM (
-            SELECT DISTINCT ON ({user_col}) *
-            FROM {table}
-            WHERE map = %s
-            ORDER BY {user_col}, run_time ASC
-        ) AS sub
-        ORDER BY run_time ASC
-        LIMIT 10;
+            SELECT best.*,
+                   ROW_NUMBER() OVER (PARTITION BY map ORDER BY run_time ASC) AS _map_rank
+            FROM (
+                SELECT DISTINCT ON (map, {user_col}) *
+                FROM {table}
+                WHERE map = ANY(%s)
+                ORDER BY map, {user_col}, run_time ASC
+            ) AS best
+        ) AS ranked
+        -- Position of each map in MAP_IDS; a join compares across integer types
+        JOIN unnest(%s) WITH ORDINALITY AS wanted(_map_id, _map_pos)
+          ON ranked.map = wanted._map_id
+        WHERE ranked._map_rank <= 10
+        ORDER BY wanted._map_pos, ranked._map_rank
     """.format(
+        columns=columns,
         user_col=USERNAME_COLUMN,
         table=TABLE_NAME
     )
 
-    with conn.cursor() as cur:
-        cur.execute(query, (map_id,))
-        rows = cur.fetchall()
-        headers = [desc[0] for desc in cur.description]
-
-    # Strip 'uid'
-    if "uid" in headers:
-        idx = headers.index("uid")
-        headers = [h for i, h in enumerate(headers) if i != idx]
-        rows = [
-            tuple(v for i, v in enumerate(row) if i != idx)
-            for row in rows
-        ]
-
-    # Add map_id at the end
-    headers.append("map_id")
-    rows = [tuple(list(r) + [map_id]) for r in rows]
-
-    return headers, rows
-
 
 def export_ff7sb(output_dir):
     """
     Export all maps into a single ff7sb.csv inside the given output_dir.
     """
+    # Ensure directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    csv_path = os.path.join(output_dir, f"{GAME_NAME.lower()}.csv")
+
     print(f"[FF7SB] Connecting to DB '{DB_NAME}'...")
     conn = get_connection(DB_NAME)
 
-    all_rows = []
-    headers = None
-
     try:
-        for map_id in MAP_IDS:
-            print(f"[FF7SB] Fetching map {map_id}...")
-            hdrs, rows = fetch_map(conn, map_id)
-
-            if headers is None:
-                headers = hdrs
-
-            all_rows.extend(rows)
+        print(f"[FF7SB] Fetching maps {MAP_IDS}...")
+        columns = get_columns(conn, TABLE_NAME, exclude=("uid",), alias="ranked")
+        # One query and one COPY for all maps: Postgres writes the CSV
+        query = maps_query(columns)
+        params = (MAP_IDS, MAP_IDS)
+        row_count = copy_to_csv(conn, query, params, csv_path)
     finally:
-        conn.close()
-        print("[FF7SB] Database connection closed.")
+        put_connection(DB_NAME, conn)
+        print("[FF7SB] Database connection released.")
 
-    if headers is None:
+    if row_count <= 0:
         print("[FF7SB] No data returned — CSV not written.")
         return
 
-    # Ensure directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
-    csv_path = os.path.join(output_dir, f"{GAME_NAME.lower()}.csv")
-
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(all_rows)
-
-    print(f"[FF7SB] Wrote {len(all_rows)} rows → {csv_path}")
+    print(f"[FF7SB] Wrote {row_count} rows → {csv_path}")